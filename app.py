@@ -1,8 +1,8 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import io
+import os
+import json
+import tempfile
 
 # ============================================
 # KONFIGURASI HALAMAN
@@ -39,247 +39,131 @@ st.markdown("---")
 # SIDEBAR - UPLOAD FILE
 # ============================================
 st.sidebar.header("📂 Upload Data")
-st.sidebar.markdown("Upload file Excel untuk Planned dan Actual Schedule")
+st.sidebar.markdown("Upload file Excel, CSV, atau Parquet untuk Planned dan Actual Schedule")
 
-planned_file = st.sidebar.file_uploader("Upload Planned Schedule", type=['xlsx', 'xls'])
-actual_file = st.sidebar.file_uploader("Upload Actual Schedule", type=['xlsx', 'xls'])
+# Sama dengan crewshift_core.SUPPORTED_FILE_TYPES (tidak di-import agar halaman upload tidak memuat pandas)
+SUPPORTED_FILE_TYPES = ['xlsx', 'xls', 'csv', 'parquet']
 
-# ============================================
-# FUNGSI UNTUK DETECT RANK
-# ============================================
-def detect_rank(rank_value):
-    """
-    Deteksi kategori rank berdasarkan kolom 'Rank' di data
-    CPT atau FO = Cockpit
-    Selain CPT dan FO = Cabin
-    """
-    rank_str = str(rank_value).upper().strip()
-    
-    # Jika Rank adalah CPT atau FO = Cockpit
-    if rank_str in ['CPT', 'FO']:
-        return 'Cockpit'
-    # Selain CPT dan FO = Cabin
-    else:
-        return 'Cabin'
+planned_file = st.sidebar.file_uploader("Upload Planned Schedule", type=SUPPORTED_FILE_TYPES)
+actual_file = st.sidebar.file_uploader("Upload Actual Schedule", type=SUPPORTED_FILE_TYPES)
+rule_set_file = st.sidebar.file_uploader(
+    "Upload Rule Set (opsional)",
+    type=['json'],
+    help="Rule set custom dalam format JSON, menggantikan pilihan rule set di bawah"
+)
 
 # ============================================
-# FUNGSI UNTUK NORMALISASI FLIGHT NUMBER
+# FUNGSI ANALISIS (CACHED)
 # ============================================
-def normalize_flight_number(flight_code):
+# Library berat (pandas, plotly, openpyxl) baru di-import setelah file di-upload,
+# supaya halaman upload tampil cepat. Logika analisis ada di crewshift_core.py.
+#
+# Data roster dan hasil analisis memakai st.cache_resource: satu objek read-only dipakai
+# bersama oleh semua session (st.cache_data memberi copy ke setiap session).
+
+# Folder file hasil analisis bersama (memory-mapped), bisa diatur lewat environment variable
+SHARED_RESULTS_DIR = os.environ.get(
+    'CREWSHIFT_SHARED_DIR', os.path.join(tempfile.gettempdir(), 'crewshift-shared')
+)
+# File hasil yang tidak dipakai selama N hari dihapus (default sama dengan crewshift_core)
+SHARED_RESULTS_MAX_AGE_DAYS = float(os.environ.get('CREWSHIFT_SHARED_MAX_AGE_DAYS', '7'))
+
+# Folder Parquet dataset summary untuk dashboard BI (kosong = tidak diekspor)
+SUMMARY_EXPORT_DIR = os.environ.get('CREWSHIFT_EXPORT_DIR', '')
+
+@st.cache_resource(max_entries=16)
+def load_roster(data, filename=''):
     """
-    Normalisasi flight number dengan menghapus suffix huruf
-    Contoh: JT111A, JT111Z, JT111D → JT111
+    Versi cached dari crewshift_core.load_roster (dipakai bersama, jangan diubah in-place)
     """
-    import re
-    
-    flight_code = str(flight_code).strip().upper()
-    
-    # Pattern: 2 huruf diikuti angka, kemudian mungkin ada huruf di akhir
-    # Contoh: JT111A → ambil JT111
-    pattern = r'([A-Z]{2})(\d+)[A-Z]?'
-    match = re.match(pattern, flight_code)
-    
-    if match:
-        # Return airline code + number (tanpa suffix huruf)
-        return match.group(1) + match.group(2)
-    
-    # Jika tidak match pattern, return as is
-    return flight_code
+    from crewshift_core import load_roster as load_roster_core
+    return load_roster_core(data, filename)
 
-def is_maintain(planned, actual):
+@st.cache_resource(max_entries=8)
+def get_shared_results(results_key, _planned_df, _actual_df, id_columns, rule_set):
     """
-    Fungsi untuk menentukan apakah schedule maintain atau change
-    
-    Aturan:
-    1. Suffix huruf diabaikan (JT111A = JT111)
-    2. SA1/SA2 (standby) → flight number = maintain
-    3. SA1/SA2 → kosong/OFF = maintain
-    4. Multiple flight harus sama urutan dan jumlahnya
-    5. Kosong ("-") vs ada isi = change
+    Hasil analisis bersama untuk satu dataset, dibaca dari file memory-mapped
+    results_key (isi file + rule set) menjadi cache key, sehingga perubahan aturan selalu dihitung ulang
+    Return: (changes_df read-only, dict Rank → (baris awal, baris akhir))
     """
-    
-    # Normalisasi: uppercase, strip spaces
-    planned = str(planned).strip().upper()
-    actual = str(actual).strip().upper()
-    
-    # Handle nilai kosong/NaN
-    if planned in ['NAN', '-', '']:
-        planned = '-'
-    if actual in ['NAN', '-', '']:
-        actual = '-'
-    
-    # Jika keduanya kosong = maintain
-    if planned == '-' and actual == '-':
-        return True
-    
-    # Jika salah satu kosong = change
-    if planned == '-' or actual == '-':
-        return False
-    
-    # RULE: SA1/SA2 (standby) → kosong/OFF = maintain
-    if planned in ['SA1', 'SA2'] and actual in ['OFF', '-']:
-        return True
-    
-    # RULE: SA1/SA2 (standby) → flight number = maintain
-    if planned in ['SA1', 'SA2']:
-        # Cek apakah actual adalah flight number (format: 2 huruf + angka)
-        import re
-        if re.match(r'[A-Z]{2}\d+', actual.split('/')[0]):
-            return True
-    
-    # Jika keduanya sama persis = maintain
-    if planned == actual:
-        return True
-    
-    # Split by slash untuk multiple flights
-    planned_flights = planned.split('/')
-    actual_flights = actual.split('/')
-    
-    # Jika jumlah flight berbeda = change
-    if len(planned_flights) != len(actual_flights):
-        return False
-    
-    # Compare setiap flight dengan normalisasi (hapus suffix huruf)
-    for p_flight, a_flight in zip(planned_flights, actual_flights):
-        p_normalized = normalize_flight_number(p_flight.strip())
-        a_normalized = normalize_flight_number(a_flight.strip())
-        
-        # Jika ada yang berbeda = change
-        if p_normalized != a_normalized:
-            return False
-    
-    # Semua sama = maintain
-    return True
+    from crewshift_core import get_shared_results as get_shared_results_core
+    path = os.path.join(SHARED_RESULTS_DIR, f"{results_key}.arrow")
+    return get_shared_results_core(
+        path, _planned_df, _actual_df, id_columns, rule_set, max_age_days=SHARED_RESULTS_MAX_AGE_DAYS
+    )
 
-# ============================================
-# FUNGSI ANALISIS
-# ============================================
-@st.cache_data
-def analyze_schedule(planned_df, actual_df, id_columns):
+@st.cache_resource(max_entries=32)
+def export_summary_dataset(results_key, _changes_df, period, rule_set_name):
     """
-    Fungsi untuk menganalisis perubahan schedule
-    Menggunakan Crew ID sebagai kunci untuk matching
+    Tulis Parquet dataset summary sekali per dataset (lihat crewshift_core.write_summary_dataset)
     """
-    # Identifikasi kolom tanggal
-    date_columns = [col for col in planned_df.columns if col not in id_columns]
-    
-    all_changes = []
-    
-    # Buat dictionary dari actual_df untuk lookup lebih cepat
-    # Key: Crew ID, Value: row data
-    actual_dict = {}
-    for idx in range(len(actual_df)):
-        crew_id = actual_df.iloc[idx]['Crew ID']
-        actual_dict[crew_id] = actual_df.iloc[idx]
-    
-    # Loop setiap crew di planned
-    for idx in range(len(planned_df)):
-        crew_id = planned_df.iloc[idx]['Crew ID']
-        crew_name = planned_df.iloc[idx]['Crew Name']
-        rank_value = planned_df.iloc[idx]['Rank']
-        
-        # Detect rank berdasarkan kolom Rank
-        rank = detect_rank(rank_value)
-        
-        # Cek apakah crew ini ada di actual
-        if crew_id not in actual_dict:
-            # Crew sudah OUT (ada di planned, tidak ada di actual)
-            # Skip crew ini atau bisa ditandai sebagai "OUT"
-            continue
-        
-        actual_row = actual_dict[crew_id]
-        
-        # Loop setiap tanggal
-        for date_col in date_columns:
-            # Ambil nilai planned dan actual
-            planned_val = str(planned_df.iloc[idx][date_col])
-            actual_val = str(actual_row[date_col])
-            
-            # Bersihkan nilai kosong
-            if planned_val == 'nan':
-                planned_val = '-'
-            if actual_val == 'nan':
-                actual_val = '-'
-            
-            # Tentukan kategori menggunakan fungsi is_maintain
-            if is_maintain(planned_val, actual_val):
-                kategori = 'maintain'
-            else:
-                kategori = 'change'
-            
-            # Simpan data
-            all_changes.append({
-                'Crew ID': crew_id,
-                'Crew Name': crew_name,
-                'Rank': rank,
-                'Tanggal': date_col,
-                'Planned': planned_val,
-                'Actual': actual_val,
-                'Kategori': kategori
-            })
-    
-    # Tambahkan crew baru yang ada di actual tapi tidak di planned
-    planned_crew_ids = set(planned_df['Crew ID'].tolist())
-    
-    for idx in range(len(actual_df)):
-        crew_id = actual_df.iloc[idx]['Crew ID']
-        
-        # Jika crew ini tidak ada di planned (crew baru)
-        if crew_id not in planned_crew_ids:
-            crew_name = actual_df.iloc[idx]['Crew Name']
-            rank_value = actual_df.iloc[idx]['Rank']
-            rank = detect_rank(rank_value)
-            
-            # Loop setiap tanggal untuk crew baru
-            for date_col in date_columns:
-                actual_val = str(actual_df.iloc[idx][date_col])
-                
-                # Bersihkan nilai kosong
-                if actual_val == 'nan':
-                    actual_val = '-'
-                
-                # Crew baru: planned = '-', actual = nilai dari data
-                # Gunakan fungsi is_maintain untuk konsistensi
-                if is_maintain('-', actual_val):
-                    kategori = 'maintain'
-                else:
-                    kategori = 'change'
-                
-                all_changes.append({
-                    'Crew ID': crew_id,
-                    'Crew Name': crew_name,
-                    'Rank': rank,
-                    'Tanggal': date_col,
-                    'Planned': '-',
-                    'Actual': actual_val,
-                    'Kategori': kategori
-                })
-    
-    changes_df = pd.DataFrame(all_changes)
-    return changes_df
+    from crewshift_core import write_summary_dataset
+    return write_summary_dataset(
+        _changes_df, SUMMARY_EXPORT_DIR, period, source_key=results_key, rule_set_name=rule_set_name
+    )
 
 # ============================================
 # MAIN APP
 # ============================================
 
 if planned_file is not None and actual_file is not None:
+    import pandas as pd
+    import plotly.graph_objects as go
+    from crewshift_core import (
+        CHANGE_TYPES, CREW_STATUSES, RULE_SETS, build_summary_tables, compile_rule_set, detect_period,
+        find_duplicate_crew, rule_set_key, shared_results_key
+    )
+    
     try:
         # Load data
         with st.spinner('📂 Membaca file...'):
-            planned_df = pd.read_excel(planned_file, header=1)
-            actual_df = pd.read_excel(actual_file, header=1)
+            planned_df = load_roster(planned_file.getvalue(), planned_file.name)
+            actual_df = load_roster(actual_file.getvalue(), actual_file.name)
         
         st.success(f"✅ Data berhasil dimuat! Planned: {len(planned_df)} rows, Actual: {len(actual_df)} rows")
         
+        # Laporkan Crew ID duplikat (hanya baris terakhir yang dianalisis)
+        for roster_label, roster_df in [('Planned', planned_df), ('Actual', actual_df)]:
+            duplicate_crew = find_duplicate_crew(roster_df)
+            if len(duplicate_crew) > 0:
+                duplicate_list = ', '.join(f"{crew_id} ({count}x)" for crew_id, count in duplicate_crew.head(10).items())
+                st.warning(
+                    f"⚠️ {roster_label}: {len(duplicate_crew)} Crew ID duplikat, hanya baris terakhir yang dipakai - {duplicate_list}"
+                )
+        
         # Setting kolom ID
-        id_columns = ['No', 'Crew ID', 'Crew Name', 'Company', 'Rank', 'Period', 'Training Qualification', 'Under Training Status', 'Crew Category']
+        id_columns = ['No', 'Crew ID', 'Crew Name', 'Company', 'Rank', 'Period', 'Training Qualification', 'Under Training Status', 'Crew Category', 'Base']
+        
+        # Pilih rule set maintain/change
+        if rule_set_file is not None:
+            rule_set = json.loads(rule_set_file.getvalue())
+        else:
+            rule_set_name = st.sidebar.selectbox(
+                "Pilih Rule Set:",
+                list(RULE_SETS),
+                help="Aturan maintain/change yang dipakai untuk analisis"
+            )
+            rule_set = RULE_SETS[rule_set_name]
+        compile_rule_set(rule_set)
+        st.sidebar.caption(f"📐 Rule set: {rule_set_key(rule_set)} - {rule_set.get('description', '')}")
         
         # Analisis data
         with st.spinner('🔍 Menganalisis data...'):
-            changes_df = analyze_schedule(planned_df, actual_df, id_columns)
+            results_key = shared_results_key(planned_file.getvalue(), actual_file.getvalue(), id_columns, rule_set)
+            changes_df, rank_slices = get_shared_results(results_key, planned_df, actual_df, id_columns, rule_set)
         
         st.success("✅ Analisis selesai!")
         
+        # Export Parquet dataset summary untuk dashboard BI (jika CREWSHIFT_EXPORT_DIR diisi)
+        if SUMMARY_EXPORT_DIR:
+            try:
+                dataset_dir = export_summary_dataset(
+                    results_key, changes_df, detect_period(planned_df), rule_set_key(rule_set)
+                )
+                st.sidebar.caption(f"📦 Summary Parquet: {dataset_dir}")
+            except (ImportError, OSError, ValueError, TypeError) as e:
+                st.warning(f"⚠️ Export Parquet dataset gagal: {str(e)}")
+        
         # ============================================
         # SIDEBAR - FILTER
         # ============================================
@@ -295,11 +179,13 @@ if planned_file is not None and actual_file is not None:
         )
         
         # Filter berdasarkan rank
+        # Hasil sudah diurutkan per Rank, jadi filter cukup berupa view (tanpa copy)
         if selected_rank == 'All':
-            filtered_df = changes_df.copy()
+            filtered_df = changes_df
             rank_label = "Semua Rank"
         else:
-            filtered_df = changes_df[changes_df['Rank'] == selected_rank].copy()
+            start_row, end_row = rank_slices.get(selected_rank, (0, 0))
+            filtered_df = changes_df.iloc[start_row:end_row]
             rank_label = selected_rank
         
         # Filter Tanggal (optional)
@@ -373,6 +259,7 @@ if planned_file is not None and actual_file is not None:
         maintain_count = len(filtered_df[filtered_df['Kategori'] == 'maintain'])
         change_count = len(filtered_df[filtered_df['Kategori'] == 'change'])
         total_crews = filtered_df['Crew ID'].nunique()
+        crew_status_counts = filtered_df.drop_duplicates('Crew ID')['Status Crew'].value_counts()
         
         maintain_pct = (maintain_count/total_data*100) if total_data > 0 else 0
         change_pct = (change_count/total_data*100) if total_data > 0 else 0
@@ -391,16 +278,22 @@ if planned_file is not None and actual_file is not None:
         with col4:
             st.metric("Total Crew", f"{total_crews}")
         
+        # Status crew: MATCH (ada di planned & actual), OUT (hanya planned), NEW (hanya actual)
+        st.caption(" | ".join(
+            f"{status}: {crew_status_counts.get(status, 0)} crew" for status in CREW_STATUSES
+        ))
+        
         st.markdown("---")
         
         # ============================================
         # TAB UNTUK VISUALISASI
         # ============================================
-        tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
             "📊 Overview", 
             "📅 Per Tanggal (Stacked)", 
             "📅 Per Tanggal (Grouped)",
             "👥 Per Rank",
+            "🔀 Jenis Perubahan",
             "📋 Data Detail"
         ])
         
@@ -751,6 +644,86 @@ if planned_file is not None and actual_file is not None:
                 st.warning("Tidak ada data untuk ditampilkan")
         
         with tab5:
+            st.subheader("Jenis Perubahan")
+            if len(filtered_df) > 0:
+                # Jumlah per jenis perubahan (hanya jenis yang muncul)
+                type_counts = filtered_df.groupby(['Jenis Perubahan', 'Kategori'], observed=True).size().reset_index(name='Jumlah')
+                type_counts['Persentase'] = (type_counts['Jumlah'] / len(filtered_df) * 100).round(1)
+                
+                fig = go.Figure()
+                
+                colors = {'maintain': '#2ecc71', 'change': '#e74c3c'}
+                
+                for kategori in ['maintain', 'change']:
+                    kategori_counts = type_counts[type_counts['Kategori'] == kategori]
+                    fig.add_trace(go.Bar(
+                        x=kategori_counts['Jenis Perubahan'].astype(str),
+                        y=kategori_counts['Jumlah'],
+                        name=kategori.capitalize(),
+                        marker_color=colors[kategori],
+                        text=[f"{pct:.1f}%<br>({count})" for count, pct in zip(kategori_counts['Jumlah'], kategori_counts['Persentase'])],
+                        textposition='outside',
+                        textfont=dict(size=14, color='white', family='Arial Bold'),
+                        customdata=kategori_counts[['Jumlah', 'Persentase']].values,
+                        hovertemplate='<b>%{x}</b><br>' +
+                                    'Kategori: ' + kategori + '<br>' +
+                                    'Jumlah: %{customdata[0]}<br>' +
+                                    'Persentase: %{customdata[1]:.1f}%<extra></extra>'
+                    ))
+                
+                fig.update_layout(
+                    title="Jumlah per Jenis Perubahan",
+                    title_font=dict(size=24, color='white', family='Arial Black'),
+                    xaxis_title="Jenis Perubahan",
+                    yaxis_title="Jumlah",
+                    xaxis=dict(
+                        title_font=dict(size=18, color='white'),
+                        tickfont=dict(size=14, color='white'),
+                        categoryorder='array',
+                        categoryarray=CHANGE_TYPES
+                    ),
+                    yaxis=dict(
+                        title_font=dict(size=18, color='white'),
+                        tickfont=dict(size=14, color='white')
+                    ),
+                    legend=dict(
+                        font=dict(size=14, color='white')
+                    ),
+                    barmode='stack',
+                    height=500,
+                    # Transparent background untuk download
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font=dict(size=14, color='white', family='Arial')
+                )
+                
+                # Config untuk download dengan background transparan
+                config = {
+                    'toImageButtonOptions': {
+                        'format': 'png',
+                        'filename': 'change_type_chart',
+                        'height': 600,
+                        'width': 1200,
+                        'scale': 2
+                    },
+                    'displayModeBar': True,
+                    'displaylogo': False
+                }
+                
+                st.plotly_chart(fig, use_container_width=True, config=config)
+                
+                # Tabel jenis perubahan per tanggal dan per rank
+                st.markdown("### 📅 Jenis Perubahan per Tanggal")
+                type_daily = filtered_df.groupby(['Tanggal', 'Jenis Perubahan'], observed=True).size().unstack(fill_value=0)
+                st.dataframe(type_daily.reset_index(), use_container_width=True, hide_index=True)
+                
+                st.markdown("### 👥 Jenis Perubahan per Rank")
+                type_rank = filtered_df.groupby(['Rank', 'Jenis Perubahan'], observed=True).size().unstack(fill_value=0)
+                st.dataframe(type_rank, use_container_width=True)
+            else:
+                st.warning("Tidak ada data untuk ditampilkan")
+        
+        with tab6:
             st.subheader("Detail Data")
             
             # Tabel Maintain dan Change per Tanggal
@@ -773,36 +746,48 @@ if planned_file is not None and actual_file is not None:
             # Download button
             st.markdown("### 💾 Download Data")
             
-            # Prepare Excel file
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                filtered_df.to_excel(writer, sheet_name='Detail Semua Data', index=False)
-                daily_summary.to_excel(writer, sheet_name='Per Tanggal', index=False)
-                
-                # Summary per crew
-                crew_summary = filtered_df.groupby(['Crew Name', 'Rank', 'Kategori']).size().unstack(fill_value=0)
-                crew_summary['Total'] = crew_summary.sum(axis=1)
-                crew_summary = crew_summary.sort_values('Total', ascending=False)
-                crew_summary.to_excel(writer, sheet_name='Per Crew')
-                
-                # Summary total
-                total_summary = filtered_df['Kategori'].value_counts().reset_index()
-                total_summary.columns = ['Kategori', 'Jumlah']
-                total_summary['Persentase'] = (total_summary['Jumlah'] / len(filtered_df) * 100).round(2).apply(lambda x: f"{x:.2f}%")
-                total_summary.to_excel(writer, sheet_name='Summary Total', index=False)
-            
-            output.seek(0)
+            # Excel (dan openpyxl) baru dibuat saat tombol download diklik
+            def build_excel_report():
+                # Tabel per rank-tanggal/crew/jenis perubahan sama persis dengan export Parquet dataset
+                summary_tables = build_summary_tables(filtered_df)
+                
+                output = io.BytesIO()
+                with pd.ExcelWriter(output, engine='openpyxl') as writer:
+                    filtered_df.to_excel(writer, sheet_name='Detail Semua Data', index=False)
+                    daily_summary.to_excel(writer, sheet_name='Per Tanggal', index=False)
+                    summary_tables['per_tanggal'].to_excel(writer, sheet_name='Per Rank dan Tanggal', index=False)
+                    
+                    # Summary per crew
+                    crew_summary = summary_tables['per_crew'].sort_values('Total', ascending=False, kind='stable')
+                    crew_summary.to_excel(writer, sheet_name='Per Crew', index=False)
+                    
+                    # Summary per jenis perubahan
+                    summary_tables['per_jenis_perubahan'].to_excel(writer, sheet_name='Per Jenis Perubahan', index=False)
+                    
+                    # Summary total
+                    total_summary = filtered_df['Kategori'].value_counts().reset_index()
+                    total_summary.columns = ['Kategori', 'Jumlah']
+                    total_summary['Persentase'] = (total_summary['Jumlah'] / len(filtered_df) * 100).round(2).apply(lambda x: f"{x:.2f}%")
+                    total_summary.to_excel(writer, sheet_name='Summary Total', index=False)
+                    
+                    # Summary status crew (MATCH / OUT / NEW)
+                    status_summary = filtered_df.groupby(['Status Crew', 'Kategori']).size().unstack(fill_value=0)
+                    status_summary['Jumlah Crew'] = filtered_df.groupby('Status Crew')['Crew ID'].nunique()
+                    status_summary.reindex(CREW_STATUSES).dropna(how='all').to_excel(writer, sheet_name='Status Crew')
+                
+                output.seek(0)
+                return output
             
             st.download_button(
                 label="📥 Download Excel",
-                data=output,
+                data=build_excel_report,
                 file_name=f"CrewShift_Analysis_{rank_label.replace(' ', '_')}.xlsx",
                 mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
             )
         
     except Exception as e:
         st.error(f"❌ Error: {str(e)}")
-        st.info("💡 Pastikan format file Excel sesuai dengan yang diharapkan")
+        st.info("💡 Pastikan format file (Excel, CSV, atau Parquet) sesuai dengan yang diharapkan")
 
 else:
     # Tampilan awal sebelum upload
@@ -811,7 +796,7 @@ else:
     st.markdown("""
     ### 📝 Cara Menggunakan:
     
-    1. **Upload File** - Upload file Excel untuk Planned dan Actual Schedule di sidebar
+    1. **Upload File** - Upload file Excel, CSV, atau Parquet untuk Planned dan Actual Schedule di sidebar
     2. **Pilih Filter** - Pilih Rank (All, Cockpit, atau Cabin)
     3. **Lihat Hasil** - Lihat visualisasi dan data di berbagai tab
     4. **Download** - Download hasil analisis dalam format Excel
@@ -829,6 +814,7 @@ else:
     
     - **Maintain** - Schedule tidak berubah antara planned dan actual
     - **Change** - Schedule berubah antara planned dan actual
+    - **Jenis Perubahan** - Rincian per sel: flight swap, OFF→flight, flight→OFF, leg added/removed, standby called/released, dll
     
     ### 👥 Rank:
     
@@ -0,0 +1,348 @@
+"""
+Differential test: classifier cepat (crewshift_core) vs implementasi referensi per sel
+
+1. Kasus tetap: setiap jenis perubahan di CHANGE_TYPES punya contoh dengan hasil yang diharapkan
+2. Pasangan kode duty acak: is_maintain() per sel vs classify_cells()
+3. Roster sintetis lengkap: loop per crew/per tanggal vs analyze_schedule()
+
+Semua hasil harus identik. Throughput kedua implementasi ikut dilaporkan.
+
+Cara pakai:
+    python check_equivalence.py
+    python check_equivalence.py --seed 7 --pairs 500000 --rosters 50 --crew 300
+"""
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from crewshift_core import (
+    CHANGE_TYPES, DEFAULT_RULE_SET, analyze_schedule, classify_cells, compile_rule_set, detect_rank, is_maintain
+)
+
+ID_COLUMNS = ['No', 'Crew ID', 'Crew Name', 'Company', 'Rank', 'Period',
+              'Training Qualification', 'Under Training Status', 'Crew Category', 'Base']
+
+# Kolom hasil yang punya padanan di implementasi referensi
+COMPARED_COLUMNS = ['Crew ID', 'Crew Name', 'Rank', 'Status Crew', 'Tanggal', 'Planned', 'Actual', 'Kategori']
+
+# Kasus tetap (rule set default): (planned, actual, maintain, jenis perubahan)
+FIXED_CASES = [
+    ('JT111', 'JT111A', True, 'unchanged'),
+    ('-', np.nan, True, 'unchanged'),
+    ('SA1', 'JT111', True, 'standby called'),
+    ('SA2', 'OFF', True, 'standby released'),
+    ('JT111', 'JT900', False, 'flight swap'),
+    ('JT111', 'JT111/JT112', False, 'leg added'),
+    ('JT111/JT112', 'JT111', False, 'leg removed'),
+    ('OFF', 'JT111', False, 'OFF→flight'),
+    (np.nan, 'JT111', False, 'OFF→flight'),
+    ('JT111', 'OFF', False, 'flight→OFF'),
+    ('JT111', '-', False, 'flight→OFF'),
+    ('TRN', 'SIM', False, 'other duty'),
+    ('OFF', '-', False, 'other duty'),
+    ('TRN', 'JT111', False, 'duty→flight'),
+    ('JT111', 'SA1', False, 'flight→standby'),
+    ('JT111', 'TRN', False, 'flight→duty'),
+    ('OFF', 'TRN', False, 'OFF→duty'),
+    ('-', 'SA1', False, 'OFF→duty'),
+    ('SA1', '-', False, 'duty→OFF'),
+    ('TRN', 'OFF', False, 'duty→OFF'),
+]
+
+# ============================================
+# GENERATOR KODE DUTY ACAK
+# ============================================
+EMPTY_VALUES = [np.nan, None, '-', '', ' ', 'nan', 'NaN', ' - ']
+DUTY_CODES = ['OFF', 'off', ' OFF ', 'SA1', 'SA2', 'sa2', 'SA3', 'RSV', 'TRN', 'SIM', 'LV', 'X', 'JT', '12']
+AIRLINES = ['JT', 'ID', 'IW', 'SA', 'jt']
+
+def random_flight(rng):
+    """
+    Flight number acak, kadang dengan suffix huruf atau spasi
+    """
+    flight = f"{rng.choice(AIRLINES)}{rng.choice(['1', '12', '13', '111', '0111', '900'])}"
+    if rng.random() < 0.3:
+        flight += rng.choice(['A', 'Z', 'D', 'AB'])
+    if rng.random() < 0.1:
+        flight = f" {flight} "
+    return flight
+
+def random_duty(rng):
+    """
+    Nilai sel acak: kosong/NaN, kode duty, flight, atau multi-leg (kadang leg kosong)
+    """
+    roll = rng.random()
+    if roll < 0.15:
+        return rng.choice(EMPTY_VALUES)
+    if roll < 0.4:
+        return rng.choice(DUTY_CODES)
+    if roll < 0.7:
+        return random_flight(rng)
+    legs = [random_flight(rng) for _ in range(rng.randint(2, 4))]
+    if rng.random() < 0.1:
+        legs.append('')
+    return '/'.join(legs)
+
+def random_pair(rng):
+    """
+    Pasangan (planned, actual); sebagian dibuat mirip supaya kasus maintain juga sering muncul
+    """
+    planned = random_duty(rng)
+    roll = rng.random()
+    if roll < 0.2 or not isinstance(planned, str):
+        return planned, random_duty(rng) if roll >= 0.1 else planned
+    if roll < 0.5:
+        # Variasi kecil: suffix huruf, huruf kecil, spasi, jumlah leg berbeda
+        legs = planned.split('/')
+        variant = rng.choice(['suffix', 'case', 'drop_leg', 'add_leg'])
+        if variant == 'suffix':
+            legs = [leg.strip() + rng.choice(['', 'A', 'Z']) for leg in legs]
+        elif variant == 'case':
+            legs = [leg.lower() for leg in legs]
+        elif variant == 'drop_leg' and len(legs) > 1:
+            legs = legs[:-1]
+        else:
+            legs = legs + [random_flight(rng)]
+        return planned, '/'.join(legs)
+    return planned, random_duty(rng)
+
+# ============================================
+# IMPLEMENTASI REFERENSI (PER CREW, PER SEL)
+# ============================================
+def clean_cell(value):
+    """
+    Bersihkan satu nilai sel seperti loop asli: kosong (NaN/None) atau 'nan' → '-'
+    """
+    if pd.isna(value) or str(value) == 'nan':
+        return '-'
+    return str(value)
+
+def reference_analyze_schedule(planned_df, actual_df, id_columns):
+    """
+    Implementasi referensi analyze_schedule: loop per crew dan per tanggal memakai is_maintain()
+    Semantik sama dengan versi cepat: Crew ID duplikat pakai baris terakhir (di posisi baris tersebut),
+    crew OUT/NEW ikut dianalisis, semua nilai kosong (NaN/None) = '-'
+    """
+    date_columns = [col for col in planned_df.columns if col not in id_columns]
+
+    def last_rows(roster_df):
+        # Dict Crew ID → baris terakhir, urut sesuai posisi baris terakhir tersebut
+        last_index = {}
+        for idx in range(len(roster_df)):
+            last_index[roster_df.iloc[idx]['Crew ID']] = idx
+        return {
+            roster_df.iloc[idx]['Crew ID']: roster_df.iloc[idx]
+            for idx in range(len(roster_df))
+            if last_index[roster_df.iloc[idx]['Crew ID']] == idx
+        }
+
+    planned_dict = last_rows(planned_df)
+    actual_dict = last_rows(actual_df)
+
+    crew_ids = list(planned_dict) + [crew_id for crew_id in actual_dict if crew_id not in planned_dict]
+
+    all_changes = []
+    for crew_id in crew_ids:
+        planned_row = planned_dict.get(crew_id)
+        actual_row = actual_dict.get(crew_id)
+        crew_row = planned_row if planned_row is not None else actual_row
+
+        if planned_row is None:
+            status = 'NEW'
+        elif actual_row is None:
+            status = 'OUT'
+        else:
+            status = 'MATCH'
+
+        for date_col in date_columns:
+            planned_val = clean_cell(planned_row[date_col]) if planned_row is not None else '-'
+            actual_val = clean_cell(actual_row[date_col]) if actual_row is not None else '-'
+
+            all_changes.append({
+                'Crew ID': crew_id,
+                'Crew Name': crew_row['Crew Name'],
+                'Rank': detect_rank(crew_row['Rank']),
+                'Status Crew': status,
+                'Tanggal': date_col,
+                'Planned': planned_val,
+                'Actual': actual_val,
+                'Kategori': 'maintain' if is_maintain(planned_val, actual_val) else 'change',
+            })
+
+    return pd.DataFrame(all_changes, columns=COMPARED_COLUMNS)
+
+# ============================================
+# GENERATOR ROSTER SINTETIS
+# ============================================
+def random_roster(rng, crew_ids, n_dates):
+    """
+    Roster acak dengan kolom ID dan kolom tanggal 1..n_dates
+    """
+    rows = []
+    for no, crew_id in enumerate(crew_ids, start=1):
+        row = {
+            'No': no,
+            'Crew ID': crew_id,
+            'Crew Name': f"CREW {crew_id}",
+            'Company': 'JT',
+            'Rank': rng.choice(['CPT', 'FO', ' fo ', 'FA', 'SFA', np.nan]),
+            'Period': 'Jun-2025',
+            'Training Qualification': np.nan,
+            'Under Training Status': np.nan,
+            'Crew Category': 'X',
+        }
+        for date in range(1, n_dates + 1):
+            row[date] = random_duty(rng)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+def random_roster_pair(rng, n_crew):
+    """
+    Planned dan actual dengan crew MATCH, OUT, NEW, dan Crew ID duplikat
+    """
+    n_dates = rng.choice([28, 30, 31])
+    crew_pool = list(range(52010000, 52010000 + n_crew * 2))
+    planned_ids = rng.sample(crew_pool, n_crew)
+    actual_ids = rng.sample(planned_ids, int(n_crew * 0.8)) + rng.sample(crew_pool, n_crew // 5)
+    # Duplikat
+    planned_ids += rng.sample(planned_ids, max(1, n_crew // 50))
+    actual_ids += rng.sample(actual_ids, max(1, n_crew // 50))
+
+    planned_df = random_roster(rng, planned_ids, n_dates)
+    actual_df = random_roster(rng, actual_ids, n_dates)
+
+    # Actual: sebagian sel disalin dari planned agar kasus maintain cukup banyak
+    planned_lookup = planned_df.drop_duplicates('Crew ID', keep='last').set_index('Crew ID')
+    for idx, crew_id in enumerate(actual_df['Crew ID']):
+        if crew_id not in planned_lookup.index:
+            continue
+        for date in range(1, n_dates + 1):
+            if rng.random() < 0.6:
+                actual_df.at[idx, date] = random_pair(rng)[1] if rng.random() < 0.3 else planned_lookup.at[crew_id, date]
+    return planned_df, actual_df
+
+# ============================================
+# PERBANDINGAN
+# ============================================
+def check_fixed_cases():
+    """
+    Cek maintain dan jenis perubahan untuk FIXED_CASES
+    Return: jumlah kasus yang salah (termasuk jenis perubahan yang belum punya contoh)
+    """
+    planned_values = np.array([planned for planned, _, _, _ in FIXED_CASES], dtype=object)
+    actual_values = np.array([actual for _, actual, _, _ in FIXED_CASES], dtype=object)
+    _, _, maintain_mask, change_type_codes = classify_cells(
+        planned_values, actual_values, compile_rule_set(DEFAULT_RULE_SET)
+    )
+
+    failures = 0
+    for (planned, actual, maintain, change_type), got_maintain, got_code in zip(
+        FIXED_CASES, maintain_mask, change_type_codes
+    ):
+        got_change_type = CHANGE_TYPES[got_code]
+        if got_maintain != maintain or got_change_type != change_type:
+            print(f"  SALAH {planned!r} → {actual!r}: diharapkan ({maintain}, {change_type}), "
+                  f"hasil ({got_maintain}, {got_change_type})")
+            failures += 1
+
+    missing = set(CHANGE_TYPES) - {change_type for _, _, _, change_type in FIXED_CASES}
+    for change_type in sorted(missing):
+        print(f"  Jenis perubahan tanpa kasus tetap: {change_type}")
+    return failures + len(missing)
+
+def check_pairs(rng, n_pairs):
+    """
+    Bandingkan is_maintain() vs classify_cells() untuk pasangan acak
+    Return: (jumlah mismatch, detik referensi, detik versi cepat)
+    """
+    pairs = [random_pair(rng) for _ in range(n_pairs)]
+    planned_values = np.array([planned for planned, _ in pairs], dtype=object)
+    actual_values = np.array([actual for _, actual in pairs], dtype=object)
+
+    start = time.perf_counter()
+    expected = np.array([
+        is_maintain(clean_cell(planned), clean_cell(actual)) for planned, actual in pairs
+    ], dtype=bool)
+    reference_seconds = time.perf_counter() - start
+
+    rules = compile_rule_set(DEFAULT_RULE_SET)
+    start = time.perf_counter()
+    _, _, actual_mask, _ = classify_cells(planned_values, actual_values, rules)
+    fast_seconds = time.perf_counter() - start
+
+    mismatches = np.flatnonzero(expected != actual_mask)
+    for idx in mismatches[:10]:
+        print(f"  MISMATCH pair {pairs[idx]!r}: referensi={expected[idx]} cepat={actual_mask[idx]}")
+    return len(mismatches), reference_seconds, fast_seconds
+
+def check_roster(rng, n_crew):
+    """
+    Bandingkan reference_analyze_schedule() vs analyze_schedule() untuk satu roster acak
+    Return: (jumlah baris berbeda, jumlah sel, detik referensi, detik versi cepat)
+    """
+    planned_df, actual_df = random_roster_pair(rng, n_crew)
+
+    start = time.perf_counter()
+    expected = reference_analyze_schedule(planned_df, actual_df, ID_COLUMNS)
+    reference_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = analyze_schedule(planned_df, actual_df, ID_COLUMNS)
+    fast_seconds = time.perf_counter() - start
+
+    result = result[COMPARED_COLUMNS]
+    if result.shape != expected.shape:
+        print(f"  MISMATCH shape: referensi={expected.shape} cepat={result.shape}")
+        return max(len(expected), len(result)), len(expected), reference_seconds, fast_seconds
+
+    differs = ~(result.astype(str).to_numpy() == expected.astype(str).to_numpy()).all(axis=1)
+    for idx in np.flatnonzero(differs)[:10]:
+        print(f"  MISMATCH row {idx}:\n    referensi={expected.iloc[idx].to_dict()}\n    cepat    ={result.iloc[idx].to_dict()}")
+    return int(differs.sum()), len(expected), reference_seconds, fast_seconds
+
+def main():
+    parser = argparse.ArgumentParser(description="Differential test classifier cepat vs referensi")
+    parser.add_argument('--seed', type=int, default=0, help="Seed random")
+    parser.add_argument('--pairs', type=int, default=200000, help="Jumlah pasangan kode duty acak")
+    parser.add_argument('--rosters', type=int, default=20, help="Jumlah roster sintetis")
+    parser.add_argument('--crew', type=int, default=150, help="Jumlah crew per roster")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    print(f"Kasus tetap ({len(FIXED_CASES)} kasus, {len(CHANGE_TYPES)} jenis perubahan)")
+    fixed_failures = check_fixed_cases()
+    print(f"  salah         : {fixed_failures}")
+
+    print(f"Pasangan kode duty acak ({args.pairs:,} pasangan, seed {args.seed})")
+    pair_mismatches, reference_seconds, fast_seconds = check_pairs(rng, args.pairs)
+    print(f"  referensi     : {args.pairs / reference_seconds:,.0f} sel/detik")
+    print(f"  cepat         : {args.pairs / fast_seconds:,.0f} sel/detik ({reference_seconds / fast_seconds:.1f}x)")
+
+    print(f"Roster sintetis ({args.rosters} roster x {args.crew} crew)")
+    roster_mismatches = 0
+    total_cells = 0
+    total_reference = 0.0
+    total_fast = 0.0
+    for _ in range(args.rosters):
+        mismatches, cells, reference_seconds, fast_seconds = check_roster(rng, args.crew)
+        roster_mismatches += mismatches
+        total_cells += cells
+        total_reference += reference_seconds
+        total_fast += fast_seconds
+    print(f"  referensi     : {total_cells / total_reference:,.0f} sel/detik")
+    print(f"  cepat         : {total_cells / total_fast:,.0f} sel/detik ({total_reference / total_fast:.1f}x)")
+
+    if fixed_failures or pair_mismatches or roster_mismatches:
+        print(f"❌ Hasil berbeda: {fixed_failures} kasus tetap, {pair_mismatches} pasangan, "
+              f"{roster_mismatches} baris roster")
+        return 1
+    print(f"✅ Identik: {args.pairs:,} pasangan, {total_cells:,} sel roster")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
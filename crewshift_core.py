@@ -0,0 +1,859 @@
+"""
+CrewShift Analyzer - core analisis
+
+Modul ini hanya bergantung pada pandas dan numpy (tanpa streamlit/plotly),
+sehingga bisa di-import dari script lain maupun dari app.py.
+"""
+import pandas as pd
+import numpy as np
+import io
+import os
+import csv
+import re
+import json
+import hashlib
+import functools
+import time
+import urllib.parse
+
+# ============================================
+# FUNGSI UNTUK MEMBACA FILE (EXCEL / CSV / PARQUET)
+# ============================================
+SUPPORTED_FILE_TYPES = ['xlsx', 'xls', 'csv', 'parquet']
+
+# Jumlah baris awal yang diperiksa untuk mencari baris header
+HEADER_SCAN_ROWS = 20
+
+# Delimiter CSV yang dicoba (Excel dengan locale Indonesia menulis ';')
+CSV_DELIMITERS = [',', ';', '\t', '|']
+
+# Encoding CSV selain UTF-8 (export "CSV" dari Excel di Windows)
+CSV_FALLBACK_ENCODING = 'cp1252'
+
+def detect_file_format(data, filename=''):
+    """
+    Deteksi format file berdasarkan magic bytes, fallback ke ekstensi
+    Return: 'parquet', 'xlsx', 'xls', atau 'csv'
+    """
+    if data[:4] == b'PAR1':
+        return 'parquet'
+    if data[:2] == b'PK':
+        return 'xlsx'
+    if data[:8] == b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1':
+        return 'xls'
+    
+    extension = str(filename).rsplit('.', 1)[-1].lower()
+    if extension in SUPPORTED_FILE_TYPES:
+        return extension
+    return 'csv'
+
+def find_header_row(rows):
+    """
+    Cari index baris yang berisi kolom 'Crew ID'
+    rows: list baris (list nilai sel) dari bagian awal file
+    Return None jika tidak ditemukan
+    """
+    for idx, row in enumerate(rows[:HEADER_SCAN_ROWS]):
+        if any(str(cell).strip().lstrip('\ufeff').strip().upper() == 'CREW ID' for cell in row):
+            return idx
+    return None
+
+def normalize_columns(df):
+    """
+    Samakan nama kolom dari semua format file
+    Header tanggal '1'..'31' (CSV/Parquet) atau 1.0 (Excel) → integer 1..31
+    Header 'CREW ID' / 'crew id' → 'Crew ID' (sama dengan pencarian di find_header_row)
+    """
+    columns = []
+    for col in df.columns:
+        col_str = str(col).strip().lstrip('\ufeff').strip()
+        if col_str.upper() == 'CREW ID':
+            col_str = 'Crew ID'
+        if col_str.endswith('.0'):
+            col_str = col_str[:-2]
+        columns.append(int(col_str) if col_str.isdigit() else col_str)
+    df.columns = columns
+    return df
+
+def detect_csv_encoding(data):
+    """
+    Encoding file CSV: 'utf-8' jika valid UTF-8, selain itu CSV_FALLBACK_ENCODING
+    """
+    try:
+        data.decode('utf-8')
+    except UnicodeDecodeError:
+        return CSV_FALLBACK_ENCODING
+    return 'utf-8'
+
+def find_csv_header(data, encoding='utf-8'):
+    """
+    Cari delimiter dan baris header CSV dari beberapa baris pertama
+    Header boleh di-quote ("Crew ID") dan file boleh diawali BOM UTF-8
+    Return: (delimiter, index baris header)
+    """
+    if encoding == 'utf-8':
+        encoding = 'utf-8-sig'
+    preview_lines = data[:65536].decode(encoding, errors='ignore').splitlines()[:HEADER_SCAN_ROWS]
+    
+    # Delimiter hasil sniffing dicoba dulu, lalu delimiter umum lainnya
+    try:
+        sniffed = csv.Sniffer().sniff('\n'.join(preview_lines), delimiters=''.join(CSV_DELIMITERS)).delimiter
+    except csv.Error:
+        sniffed = ','
+    
+    for delimiter in [sniffed] + [d for d in CSV_DELIMITERS if d != sniffed]:
+        header_row = find_header_row(list(csv.reader(preview_lines, delimiter=delimiter)))
+        if header_row is not None:
+            return delimiter, header_row
+    
+    raise ValueError("Kolom 'Crew ID' tidak ditemukan di file CSV")
+
+def read_csv_roster(data):
+    """
+    Baca CSV dengan pyarrow.csv (multi-threaded), fallback ke pandas
+    File yang bukan UTF-8 dibaca sebagai cp1252
+    """
+    encoding = detect_csv_encoding(data)
+    delimiter, header_row = find_csv_header(data, encoding)
+    
+    try:
+        import pyarrow.csv as pacsv
+    except ImportError:
+        return pd.read_csv(
+            io.BytesIO(data), sep=delimiter, skiprows=header_row,
+            encoding='utf-8-sig' if encoding == 'utf-8' else encoding
+        )
+    
+    table = pacsv.read_csv(
+        io.BytesIO(data),
+        read_options=pacsv.ReadOptions(skip_rows=header_row, use_threads=True, encoding=encoding),
+        parse_options=pacsv.ParseOptions(delimiter=delimiter),
+        convert_options=pacsv.ConvertOptions(strings_can_be_null=True)
+    )
+    
+    # Kolom yang seluruhnya kosong bertipe null (None) → samakan dengan NaN seperti read_excel
+    null_columns = {field.name: 'float64' for field in table.schema if str(field.type) == 'null'}
+    return table.to_pandas().astype(null_columns)
+
+def read_excel_roster(data):
+    """
+    Baca semua sheet di workbook Excel
+    Setiap sheet dianggap satu base/fleet, sheet tanpa kolom 'Crew ID' dilewati
+    Nama sheet dipakai sebagai kolom 'Base' hanya jika sheet belum punya kolom 'Base'
+    """
+    workbook = pd.ExcelFile(io.BytesIO(data))
+    
+    sheets = []
+    for sheet_name in workbook.sheet_names:
+        preview = workbook.parse(sheet_name, header=None, nrows=HEADER_SCAN_ROWS)
+        header_row = find_header_row(preview.values.tolist())
+        if header_row is None:
+            continue
+        
+        sheet_df = normalize_columns(workbook.parse(sheet_name, header=header_row))
+        sheets.append((sheet_name, sheet_df))
+    
+    if not sheets:
+        raise ValueError("Kolom 'Crew ID' tidak ditemukan di sheet manapun")
+    
+    # Kolom Base dari nama sheet hanya berguna jika workbook berisi lebih dari satu base/fleet
+    if len(sheets) > 1:
+        sheets = [
+            (sheet_name, sheet_df if 'Base' in sheet_df.columns else sheet_df.assign(Base=sheet_name))
+            for sheet_name, sheet_df in sheets
+        ]
+    
+    return pd.concat([sheet_df for _, sheet_df in sheets], ignore_index=True)
+
+def load_roster(data, filename=''):
+    """
+    Baca file roster (Excel, CSV, atau Parquet) ke format DataFrame yang sama
+    Format dan baris header dideteksi otomatis
+    """
+    file_format = detect_file_format(data, filename)
+    
+    if file_format == 'parquet':
+        roster_df = pd.read_parquet(io.BytesIO(data))
+    elif file_format == 'csv':
+        roster_df = read_csv_roster(data)
+    else:
+        roster_df = read_excel_roster(data)
+    
+    roster_df = normalize_columns(roster_df)
+    
+    # Buang baris kosong (tanpa Crew ID), misal baris total di bawah tabel
+    return roster_df.dropna(subset=['Crew ID']).reset_index(drop=True)
+
+# ============================================
+# FUNGSI UNTUK DETECT RANK
+# ============================================
+def detect_rank(rank_value):
+    """
+    Deteksi kategori rank berdasarkan kolom 'Rank' di data
+    CPT atau FO = Cockpit
+    Selain CPT dan FO = Cabin
+    """
+    rank_str = str(rank_value).upper().strip()
+    
+    # Jika Rank adalah CPT atau FO = Cockpit
+    if rank_str in ['CPT', 'FO']:
+        return 'Cockpit'
+    # Selain CPT dan FO = Cabin
+    else:
+        return 'Cabin'
+
+# ============================================
+# FUNGSI UNTUK NORMALISASI FLIGHT NUMBER
+# ============================================
+def normalize_flight_number(flight_code):
+    """
+    Normalisasi flight number dengan menghapus suffix huruf
+    Contoh: JT111A, JT111Z, JT111D → JT111
+    """
+    import re
+    
+    flight_code = str(flight_code).strip().upper()
+    
+    # Pattern: 2 huruf diikuti angka, kemudian mungkin ada huruf di akhir
+    # Contoh: JT111A → ambil JT111
+    pattern = r'([A-Z]{2})(\d+)[A-Z]?'
+    match = re.match(pattern, flight_code)
+    
+    if match:
+        # Return airline code + number (tanpa suffix huruf)
+        return match.group(1) + match.group(2)
+    
+    # Jika tidak match pattern, return as is
+    return flight_code
+
+def is_maintain(planned, actual):
+    """
+    Fungsi untuk menentukan apakah schedule maintain atau change
+    
+    Aturan:
+    1. Suffix huruf diabaikan (JT111A = JT111)
+    2. SA1/SA2 (standby) → flight number = maintain
+    3. SA1/SA2 → kosong/OFF = maintain
+    4. Multiple flight harus sama urutan dan jumlahnya
+    5. Kosong ("-") vs ada isi = change
+    """
+    
+    # Normalisasi: uppercase, strip spaces
+    planned = str(planned).strip().upper()
+    actual = str(actual).strip().upper()
+    
+    # Handle nilai kosong/NaN
+    if planned in ['NAN', '-', '']:
+        planned = '-'
+    if actual in ['NAN', '-', '']:
+        actual = '-'
+    
+    # Jika keduanya kosong = maintain
+    if planned == '-' and actual == '-':
+        return True
+    
+    # Jika salah satu kosong = change
+    if planned == '-' or actual == '-':
+        return False
+    
+    # RULE: SA1/SA2 (standby) → kosong/OFF = maintain
+    if planned in ['SA1', 'SA2'] and actual in ['OFF', '-']:
+        return True
+    
+    # RULE: SA1/SA2 (standby) → flight number = maintain
+    if planned in ['SA1', 'SA2']:
+        # Cek apakah actual adalah flight number (format: 2 huruf + angka)
+        import re
+        if re.match(r'[A-Z]{2}\d+', actual.split('/')[0]):
+            return True
+    
+    # Jika keduanya sama persis = maintain
+    if planned == actual:
+        return True
+    
+    # Split by slash untuk multiple flights
+    planned_flights = planned.split('/')
+    actual_flights = actual.split('/')
+    
+    # Jika jumlah flight berbeda = change
+    if len(planned_flights) != len(actual_flights):
+        return False
+    
+    # Compare setiap flight dengan normalisasi (hapus suffix huruf)
+    for p_flight, a_flight in zip(planned_flights, actual_flights):
+        p_normalized = normalize_flight_number(p_flight.strip())
+        a_normalized = normalize_flight_number(a_flight.strip())
+        
+        # Jika ada yang berbeda = change
+        if p_normalized != a_normalized:
+            return False
+    
+    # Semua sama = maintain
+    return True
+
+# ============================================
+# RULE SET MAINTAIN/CHANGE
+# ============================================
+# Rule set bersifat deklaratif (bisa disimpan sebagai JSON) dan diberi versi.
+# Naikkan 'version' setiap kali aturan diubah agar hasil cache lama tidak dipakai.
+DEFAULT_RULE_SET = {
+    'name': 'default',
+    'version': 1,
+    'description': 'Aturan standar: SA1/SA2 standby, suffix huruf flight diabaikan',
+    # Nilai yang dianggap kosong ("-")
+    'empty_codes': ['-', 'NAN', ''],
+    # Standby → flight number atau release code = maintain
+    'standby_codes': ['SA1', 'SA2'],
+    'standby_release_codes': ['OFF'],
+    'standby_to_flight': True,
+    # Kelompok kode yang dianggap sama (contoh: [['TRN', 'SIM']])
+    'equivalent_codes': [],
+    # JT111A = JT111
+    'ignore_flight_suffix': True,
+}
+
+RULE_SETS = {
+    'default': DEFAULT_RULE_SET,
+    'standby-reserve': {
+        **DEFAULT_RULE_SET,
+        'name': 'standby-reserve',
+        'version': 1,
+        'description': 'Default + SA3 dan reserve (RSV, RS1, RS2) diperlakukan seperti standby',
+        'standby_codes': ['SA1', 'SA2', 'SA3', 'RSV', 'RS1', 'RS2'],
+    },
+    'training-maintain': {
+        **DEFAULT_RULE_SET,
+        'name': 'training-maintain',
+        'version': 1,
+        'description': 'Default + perubahan antar duty training (TRN, SIM, GRD) = maintain',
+        'equivalent_codes': [['TRN', 'SIM', 'GRD']],
+    },
+}
+
+# Jenis perubahan per sel, disimpan sebagai kode integer (index di list ini)
+CHANGE_TYPES = [
+    'unchanged',         # sama (termasuk beda suffix huruf saja)
+    'standby called',    # standby → flight
+    'standby released',  # standby → OFF
+    'flight swap',       # flight → flight lain, jumlah leg sama
+    'leg added',         # jumlah leg bertambah
+    'leg removed',       # jumlah leg berkurang
+    'OFF→flight',        # OFF/kosong → flight
+    'flight→OFF',        # flight → OFF/kosong
+    'other duty',        # duty non-flight → duty non-flight lain (atau OFF ↔ kosong)
+    'duty→flight',       # duty non-flight (training, dll) → flight
+    'flight→standby',    # flight → standby
+    'flight→duty',       # flight → duty non-flight lain
+    'OFF→duty',          # OFF/kosong → duty non-flight (termasuk standby)
+    'duty→OFF',          # duty non-flight (termasuk standby) → OFF/kosong
+]
+CHANGE_TYPE_CODES = {change_type: code for code, change_type in enumerate(CHANGE_TYPES)}
+
+# Versi logika classifier (parse_duty_code, decide_pair, classify_cells).
+# Naikkan setiap kali hasil maintain/jenis perubahan bisa berubah untuk input yang sama.
+CLASSIFIER_VERSION = 2
+
+# Pattern flight number: 2 huruf + angka, mungkin diikuti suffix huruf
+FLIGHT_PATTERN = re.compile(r'([A-Z]{2})(\d+)[A-Z]?')
+
+def rule_set_key(rule_set):
+    """
+    Identitas rule set untuk ditampilkan dan untuk cache, contoh: default@v1
+    """
+    return f"{rule_set['name']}@v{rule_set['version']}"
+
+def compile_rule_set(rule_set):
+    """
+    Compile rule set deklaratif menjadi lookup table (set/dict) sekali saja
+    Hasil compile di-cache per isi rule set
+    """
+    unknown_keys = set(rule_set) - set(DEFAULT_RULE_SET)
+    if unknown_keys:
+        raise ValueError(f"Rule set tidak dikenal: {', '.join(sorted(unknown_keys))}")
+    for required_key in ['name', 'version']:
+        if required_key not in rule_set:
+            raise ValueError(f"Rule set wajib memiliki '{required_key}'")
+    
+    # Cek tipe nilai, contoh: "standby_codes": "SA1" akan terbaca sebagai kode S, A, 1
+    for key in ['empty_codes', 'standby_codes', 'standby_release_codes']:
+        if key in rule_set and not isinstance(rule_set[key], list):
+            raise ValueError(f"'{key}' harus berupa list kode, contoh: [\"SA1\", \"SA2\"]")
+    if 'equivalent_codes' in rule_set and not (
+        isinstance(rule_set['equivalent_codes'], list)
+        and all(isinstance(group, list) for group in rule_set['equivalent_codes'])
+    ):
+        raise ValueError("'equivalent_codes' harus berupa list kelompok kode, contoh: [[\"TRN\", \"SIM\"]]")
+    for key in ['standby_to_flight', 'ignore_flight_suffix']:
+        if key in rule_set and not isinstance(rule_set[key], bool):
+            raise ValueError(f"'{key}' harus berupa true/false")
+    
+    return _compile_rule_set(json.dumps({**DEFAULT_RULE_SET, **rule_set}, sort_keys=True))
+
+@functools.lru_cache(maxsize=32)
+def _compile_rule_set(rule_set_json):
+    rule_set = json.loads(rule_set_json)
+    
+    # Setiap kode di kelompok equivalent dipetakan ke kode pertama kelompoknya
+    equivalents = {}
+    for group in rule_set['equivalent_codes']:
+        group = [str(code).strip().upper() for code in group]
+        for code in group:
+            equivalents[code] = group[0]
+    
+    return {
+        'key': rule_set_key(rule_set),
+        'empty_codes': frozenset(str(code).strip().upper() for code in rule_set['empty_codes']),
+        'standby_codes': frozenset(str(code).strip().upper() for code in rule_set['standby_codes']),
+        'standby_release_codes': frozenset(str(code).strip().upper() for code in rule_set['standby_release_codes']),
+        'standby_to_flight': bool(rule_set['standby_to_flight']),
+        'equivalents': equivalents,
+        'ignore_flight_suffix': bool(rule_set['ignore_flight_suffix']),
+    }
+
+def parse_duty_code(rules, value):
+    """
+    Normalisasi satu kode duty (dilakukan sekali per kode unik)
+    Return: (kode, tuple flight per leg, apakah leg pertama flight number)
+    """
+    code = value.strip().upper()
+    if code in rules['empty_codes']:
+        code = '-'
+    code = rules['equivalents'].get(code, code)
+    
+    legs = []
+    for leg in code.split('/'):
+        leg = leg.strip()
+        match = FLIGHT_PATTERN.match(leg)
+        if match and rules['ignore_flight_suffix']:
+            leg = match.group(1) + match.group(2)
+        legs.append(rules['equivalents'].get(leg, leg))
+    
+    is_flight = re.match(r'[A-Z]{2}\d+', code.split('/')[0]) is not None
+    
+    return code, tuple(legs), is_flight
+
+def decide_pair(rules, planned_token, actual_token):
+    """
+    Versi compiled dari is_maintain() plus jenis perubahan
+    Input: hasil parse_duty_code() untuk planned dan actual
+    Return: (True = maintain / False = change, kode jenis perubahan)
+    """
+    planned_code, planned_legs, planned_is_flight = planned_token
+    actual_code, actual_legs, actual_is_flight = actual_token
+    planned_is_standby = planned_code in rules['standby_codes']
+    actual_is_release = actual_code in rules['standby_release_codes']
+    
+    # Maintain atau change
+    if planned_code == '-' or actual_code == '-':
+        maintain = planned_code == actual_code
+    elif planned_is_standby and (actual_is_release or (rules['standby_to_flight'] and actual_is_flight)):
+        maintain = True
+    else:
+        maintain = planned_code == actual_code or planned_legs == actual_legs
+    
+    # Jenis perubahan (kode standby tidak dihitung sebagai flight number)
+    # OFF = sel kosong atau kode release (contoh: OFF)
+    actual_is_standby = actual_code in rules['standby_codes']
+    planned_is_flight = planned_is_flight and not planned_is_standby
+    actual_is_flight = actual_is_flight and not actual_is_standby
+    planned_is_off = planned_code == '-' or planned_code in rules['standby_release_codes']
+    actual_is_off = actual_code == '-' or actual_is_release
+    
+    if planned_is_standby and actual_is_flight:
+        change_type = 'standby called'
+    elif planned_is_standby and actual_is_release:
+        change_type = 'standby released'
+    elif maintain:
+        change_type = 'unchanged'
+    elif planned_is_flight and actual_is_flight:
+        if len(planned_legs) < len(actual_legs):
+            change_type = 'leg added'
+        elif len(planned_legs) > len(actual_legs):
+            change_type = 'leg removed'
+        else:
+            change_type = 'flight swap'
+    elif actual_is_flight:
+        change_type = 'OFF→flight' if planned_is_off else 'duty→flight'
+    elif planned_is_flight:
+        if actual_is_off:
+            change_type = 'flight→OFF'
+        elif actual_is_standby:
+            change_type = 'flight→standby'
+        else:
+            change_type = 'flight→duty'
+    elif planned_is_off and not actual_is_off:
+        change_type = 'OFF→duty'
+    elif actual_is_off and not planned_is_off:
+        change_type = 'duty→OFF'
+    else:
+        change_type = 'other duty'
+    
+    return maintain, CHANGE_TYPE_CODES[change_type]
+
+def factorize_cells(values):
+    """
+    Ubah array nilai sel menjadi (codes, labels) dengan label string yang sudah dibersihkan
+    Semua nilai kosong (NaN, None, pd.NA, string 'nan') → '-'
+    """
+    codes, uniques = pd.factorize(values)
+    labels = np.array(['-' if str(value) == 'nan' else str(value) for value in uniques] + ['-'], dtype=object)
+    # Kode -1 (nilai kosong) diarahkan ke label '-' terakhir
+    codes[codes < 0] = len(uniques)
+    return codes, labels
+
+def classify_cells(planned_values, actual_values, rules):
+    """
+    Klasifikasi semua sel sekaligus tanpa loop per sel
+    Setiap kode unik hanya di-parse satu kali dan setiap pasangan kode unik hanya diputuskan satu kali
+    Return: (label planned, label actual, mask maintain, kode jenis perubahan)
+    """
+    planned_codes, planned_labels = factorize_cells(planned_values)
+    actual_codes, actual_labels = factorize_cells(actual_values)
+    
+    n_actual = max(len(actual_labels), 1)
+    pair_codes = planned_codes.astype(np.int64) * n_actual + actual_codes
+    unique_pairs, pair_inverse = np.unique(pair_codes, return_inverse=True)
+    
+    planned_tokens = [parse_duty_code(rules, label) for label in planned_labels]
+    actual_tokens = [parse_duty_code(rules, label) for label in actual_labels]
+    decisions = [
+        decide_pair(rules, planned_tokens[pair // n_actual], actual_tokens[pair % n_actual])
+        for pair in unique_pairs
+    ]
+    maintain_table = np.array([maintain for maintain, _ in decisions], dtype=bool)
+    change_type_table = np.array([change_type for _, change_type in decisions], dtype=np.int8)
+    
+    return (
+        planned_labels[planned_codes],
+        actual_labels[actual_codes],
+        maintain_table[pair_inverse],
+        change_type_table[pair_inverse],
+    )
+
+# ============================================
+# FUNGSI REKONSILIASI CREW (PLANNED VS ACTUAL)
+# ============================================
+CREW_STATUSES = ['MATCH', 'OUT', 'NEW']
+
+def find_duplicate_crew(roster_df):
+    """
+    Cari Crew ID yang muncul lebih dari sekali
+    Return: Series Crew ID → jumlah baris (kosong jika tidak ada duplikat)
+    """
+    crew_counts = roster_df['Crew ID'].value_counts()
+    return crew_counts[crew_counts > 1]
+
+def reconcile_roster(planned_df, actual_df):
+    """
+    Gabungkan crew planned dan actual (outer join pada Crew ID)
+    MATCH = ada di keduanya, OUT = hanya di planned, NEW = hanya di actual
+    Urutan: crew planned sesuai urutan file, lalu crew NEW
+    """
+    crew_columns = ['Crew ID', 'Crew Name', 'Rank']
+    
+    in_actual = planned_df['Crew ID'].isin(actual_df['Crew ID'])
+    new_crew_df = actual_df[~actual_df['Crew ID'].isin(planned_df['Crew ID'])]
+    
+    crew_df = pd.concat([planned_df[crew_columns], new_crew_df[crew_columns]], ignore_index=True)
+    crew_df['Status Crew'] = np.concatenate([
+        np.where(in_actual, 'MATCH', 'OUT'),
+        np.full(len(new_crew_df), 'NEW', dtype=object),
+    ])
+    return crew_df
+
+# ============================================
+# FUNGSI ANALISIS
+# ============================================
+def analyze_schedule(planned_df, actual_df, id_columns, rule_set=DEFAULT_RULE_SET):
+    """
+    Fungsi untuk menganalisis perubahan schedule
+    Menggunakan Crew ID sebagai kunci untuk matching (outer join, lihat reconcile_roster)
+    rule_set: rule set maintain/change (lihat RULE_SETS)
+    """
+    rules = compile_rule_set(rule_set)
+    
+    # Identifikasi kolom tanggal
+    date_columns = [col for col in planned_df.columns if col not in id_columns]
+    
+    # Crew ID duplikat: baris terakhir yang dipakai (lihat find_duplicate_crew)
+    planned_df = planned_df.drop_duplicates('Crew ID', keep='last')
+    actual_df = actual_df.drop_duplicates('Crew ID', keep='last')
+    
+    crew_df = reconcile_roster(planned_df, actual_df)
+    
+    # Outer join nilai per tanggal: crew NEW tidak punya planned, crew OUT tidak punya actual (NaN → '-')
+    planned_values = planned_df.set_index('Crew ID').reindex(
+        index=crew_df['Crew ID'], columns=date_columns
+    ).to_numpy(dtype=object)
+    actual_values = actual_df.set_index('Crew ID').reindex(
+        index=crew_df['Crew ID'], columns=date_columns
+    ).to_numpy(dtype=object)
+    
+    # Klasifikasi semua sel (urutan: per crew, lalu per tanggal)
+    planned_labels, actual_labels, maintain_mask, change_type_codes = classify_cells(
+        planned_values.ravel(), actual_values.ravel(), rules
+    )
+    
+    n_dates = len(date_columns)
+    changes_df = pd.DataFrame({
+        'Crew ID': np.repeat(crew_df['Crew ID'].to_numpy(), n_dates),
+        'Crew Name': np.repeat(crew_df['Crew Name'].to_numpy(), n_dates),
+        'Rank': np.repeat(crew_df['Rank'].map(detect_rank).to_numpy(), n_dates),
+        'Status Crew': np.repeat(crew_df['Status Crew'].to_numpy(), n_dates),
+        'Tanggal': np.tile(np.asarray(date_columns), len(crew_df)),
+        'Planned': planned_labels,
+        'Actual': actual_labels,
+        'Kategori': np.where(maintain_mask, 'maintain', 'change'),
+        # Disimpan sebagai kode integer kecil (categorical)
+        'Jenis Perubahan': pd.Categorical.from_codes(change_type_codes, categories=CHANGE_TYPES),
+    })
+    return changes_df
+
+# ============================================
+# HASIL ANALISIS BERSAMA (MEMORY-MAPPED)
+# ============================================
+# Hasil analisis disimpan sekali sebagai file Arrow IPC (kolumnar, read-only) lalu
+# di-memory-map, sehingga semua session/worker yang membuka dataset yang sama
+# memakai halaman memori yang sama. Naikkan versi ini jika layout file berubah.
+SHARED_RESULTS_FORMAT_VERSION = 1
+# File hasil yang tidak dipakai selama ini dihapus saat file baru ditulis
+SHARED_RESULTS_MAX_AGE_DAYS = 7
+
+def shared_results_key(planned_data, actual_data, id_columns, rule_set):
+    """
+    Key unik untuk satu dataset: isi file planned/actual, kolom ID, rule set,
+    versi classifier (plus daftar jenis perubahan), dan versi format
+    """
+    digest = hashlib.sha256()
+    digest.update(planned_data)
+    digest.update(actual_data)
+    digest.update(json.dumps({
+        'id_columns': list(id_columns),
+        'rule_set': rule_set,
+        'classifier_version': CLASSIFIER_VERSION,
+        'change_types': CHANGE_TYPES,
+        'format_version': SHARED_RESULTS_FORMAT_VERSION,
+    }, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+def sort_results_by_rank(changes_df):
+    """
+    Urutkan hasil per Rank (stabil, urutan crew dalam rank tetap)
+    Return: (changes_df, dict Rank → (baris awal, baris akhir))
+    Filter rank cukup memakai iloc[awal:akhir] (view, bukan copy)
+    """
+    changes_df = changes_df.sort_values('Rank', kind='stable', ignore_index=True)
+    rank_slices = {
+        rank: (int(rows[0]), int(rows[-1]) + 1)
+        for rank, rows in changes_df.groupby('Rank', sort=False).indices.items()
+    }
+    return changes_df, rank_slices
+
+def save_shared_results(changes_df, path):
+    """
+    Simpan hasil analisis (sudah diurutkan per Rank) sebagai file Arrow IPC tanpa kompresi
+    Ditulis ke file sementara lalu di-rename, supaya worker lain tidak membaca file setengah jadi
+    """
+    import pyarrow as pa
+    
+    changes_df, rank_slices = sort_results_by_rank(changes_df)
+    table = pa.Table.from_pandas(changes_df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'crewshift.rank_slices': json.dumps(rank_slices).encode('utf-8'),
+    })
+    
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # Jangan tinggalkan file sementara setengah jadi (contoh: disk penuh)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def open_shared_results(path):
+    """
+    Buka file hasil analisis secara memory-mapped (zero-copy untuk kolom angka dan string)
+    Return: (changes_df, dict Rank → (baris awal, baris akhir))
+    """
+    import pyarrow as pa
+    
+    table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+    rank_slices = {
+        rank: tuple(bounds)
+        for rank, bounds in json.loads(table.schema.metadata[b'crewshift.rank_slices']).items()
+    }
+    # Kolom string zero-copy butuh pandas >= 3 (dtype str berbasis Arrow)
+    return table.to_pandas(split_blocks=True), rank_slices
+
+def prune_shared_results(directory, max_age_days=SHARED_RESULTS_MAX_AGE_DAYS):
+    """
+    Hapus file hasil (.arrow) dan sisa file sementara (.tmp) yang tidak dipakai selama max_age_days
+    File yang masih di-memory-map worker lain tetap bisa dibaca sampai ditutup (POSIX)
+    Return: jumlah file yang dihapus
+    """
+    cutoff = time.time() - max_age_days * 24 * 60 * 60
+    removed = 0
+    for entry in os.scandir(directory):
+        if not entry.name.endswith(('.arrow', '.tmp')):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            # Sudah dihapus worker lain, atau masih dikunci (Windows)
+            continue
+    return removed
+
+def get_shared_results(path, planned_df, actual_df, id_columns, rule_set=DEFAULT_RULE_SET,
+                       max_age_days=SHARED_RESULTS_MAX_AGE_DAYS):
+    """
+    Ambil hasil analisis dari file bersama, analisis dan simpan dulu jika belum ada
+    Setiap file baru ditulis, file lain di folder yang sama yang lebih lama dari max_age_days dihapus
+    Jika pyarrow tidak tersedia, data tidak bisa disimpan sebagai Arrow, atau folder tidak bisa ditulis,
+    hasil dikembalikan langsung dari memori (tetap diurutkan per Rank)
+    Return: (changes_df, dict Rank → (baris awal, baris akhir))
+    """
+    if os.path.exists(path):
+        # Tandai file masih dipakai supaya tidak ikut dihapus prune_shared_results()
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return open_shared_results(path)
+    
+    changes_df = analyze_schedule(planned_df, actual_df, id_columns, rule_set)
+    try:
+        save_shared_results(changes_df, path)
+    except (ImportError, ValueError, TypeError, OSError):
+        return sort_results_by_rank(changes_df)
+    prune_shared_results(os.path.dirname(path) or '.', max_age_days)
+    return open_shared_results(path)
+
+# ============================================
+# EXPORT SUMMARY KE PARQUET DATASET
+# ============================================
+# Tabel summary (per tanggal, per rank, per crew, per jenis perubahan) dan detail
+# ringkas ditulis sebagai Parquet dataset yang dipartisi per Period dan Rank
+# (hive: Period=.../Rank=...). Setiap export hanya mengganti partisi miliknya,
+# partisi periode lain tidak disentuh. Naikkan versi ini jika skema tabel berubah.
+SUMMARY_DATASET_VERSION = 1
+
+def detect_period(roster_df):
+    """
+    Periode roster dari kolom 'Period' (nilai terbanyak), 'unknown' jika tidak ada
+    """
+    if 'Period' not in roster_df.columns:
+        return 'unknown'
+    periods = roster_df['Period'].dropna().astype(str).str.strip()
+    periods = periods[periods != '']
+    if periods.empty:
+        return 'unknown'
+    return periods.value_counts().index[0]
+
+def count_by_kategori(changes_df, group_columns):
+    """
+    Jumlah maintain/change per grup, dengan kolom Total dan Maintain (%)
+    Grup dengan nilai kosong (contoh: crew tanpa Crew Name) tetap dihitung
+    """
+    summary_df = changes_df.groupby(
+        group_columns + ['Kategori'], observed=True, dropna=False
+    ).size().unstack(fill_value=0)
+    summary_df = summary_df.reindex(columns=['maintain', 'change'], fill_value=0)
+    summary_df.columns = ['maintain', 'change']
+    summary_df['Total'] = summary_df['maintain'] + summary_df['change']
+    summary_df['Maintain (%)'] = (summary_df['maintain'] / summary_df['Total'] * 100).round(2)
+    return summary_df.reset_index()
+
+def build_summary_tables(changes_df):
+    """
+    Buat tabel summary dan detail ringkas dari hasil analyze_schedule()
+    Semua tabel punya kolom 'Rank' (kolom partisi)
+    Return: dict nama tabel → DataFrame
+    """
+    detail_df = pd.DataFrame({
+        'Rank': changes_df['Rank'],
+        'Crew ID': changes_df['Crew ID'],
+        'Tanggal': changes_df['Tanggal'],
+        'Planned': changes_df['Planned'].astype('category'),
+        'Actual': changes_df['Actual'].astype('category'),
+        'Maintain': changes_df['Kategori'].to_numpy() == 'maintain',
+        # Index di CHANGE_TYPES (juga disimpan di _manifest.json)
+        'Kode Perubahan': changes_df['Jenis Perubahan'].cat.codes.astype(np.int8),
+        'Status Crew': changes_df['Status Crew'].astype('category'),
+    })
+    if pd.api.types.is_integer_dtype(detail_df['Tanggal']):
+        detail_df['Tanggal'] = detail_df['Tanggal'].astype(np.int8)
+    
+    return {
+        'per_tanggal': count_by_kategori(changes_df, ['Rank', 'Tanggal']),
+        'per_rank': count_by_kategori(changes_df, ['Rank']),
+        'per_crew': count_by_kategori(changes_df, ['Rank', 'Crew ID', 'Crew Name', 'Status Crew']),
+        'per_jenis_perubahan': changes_df.groupby(
+            ['Rank', 'Jenis Perubahan', 'Kategori'], observed=True, dropna=False
+        ).size().reset_index(name='Jumlah'),
+        'detail': detail_df,
+    }
+
+def write_summary_dataset(changes_df, root_dir, period, source_key='', rule_set_name=''):
+    """
+    Tulis tabel summary ke <root_dir>/v<versi>/<tabel>/Period=<period>/Rank=<rank>/
+    Partisi lama untuk period dan rank yang sama diganti, partisi lain tetap
+    _manifest.json mencatat versi, daftar jenis perubahan, dan partisi yang sudah ditulis
+    Return: path folder dataset (dengan versi)
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    
+    dataset_dir = os.path.join(root_dir, f"v{SUMMARY_DATASET_VERSION}")
+    partitioning = ds.partitioning(
+        pa.schema([('Period', pa.string()), ('Rank', pa.string())]), flavor='hive'
+    )
+    
+    tables = build_summary_tables(changes_df)
+    for table_name, table_df in tables.items():
+        table = pa.Table.from_pandas(table_df.assign(Period=str(period)), preserve_index=False)
+        ds.write_dataset(
+            table,
+            base_dir=os.path.join(dataset_dir, table_name),
+            format='parquet',
+            partitioning=partitioning,
+            existing_data_behavior='delete_matching',
+            basename_template=f"{source_key or 'part'}-{{i}}.parquet",
+        )
+    
+    # Update manifest (digabung dengan partisi dari export sebelumnya)
+    manifest_path = os.path.join(dataset_dir, '_manifest.json')
+    manifest = {'partitions': {}}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding='utf-8') as manifest_file:
+            manifest = json.load(manifest_file)
+    
+    # Key partisi di-encode sama seperti nama folder dari pyarrow (contoh: Jun/2025 → Jun%2F2025)
+    written_at = pd.Timestamp.now(tz='UTC').isoformat()
+    period_segment = urllib.parse.quote(str(period), safe='')
+    for rank in sorted(changes_df['Rank'].unique()):
+        rank_segment = urllib.parse.quote(str(rank), safe='')
+        manifest['partitions'][f"Period={period_segment}/Rank={rank_segment}"] = {
+            'source_key': source_key,
+            'rule_set': rule_set_name,
+            'written_at': written_at,
+        }
+    manifest.update({
+        'version': SUMMARY_DATASET_VERSION,
+        'tables': list(tables),
+        'partitioning': ['Period', 'Rank'],
+        'change_types': CHANGE_TYPES,
+    })
+    
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    
+    return dataset_dir
@@ -0,0 +1,92 @@
+"""
+Ukur waktu tampil halaman upload CrewShift Analyzer (tanpa file di-upload)
+
+Setiap percobaan dijalankan di proses Python baru, seperti worker Streamlit yang
+baru start. Yang diukur hanya eksekusi app.py (streamlit sudah di-import),
+lalu dicek library berat apa saja yang ikut di-import oleh app.py.
+
+Cara pakai:
+    python measure_startup.py
+    python measure_startup.py --runs 5 --budget 0.5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+# Library yang tidak boleh di-import sebelum ada file yang di-upload
+HEAVY_MODULES = ['pandas', 'numpy', 'plotly', 'openpyxl', 'pyarrow', 'crewshift_core']
+
+CHILD_SCRIPT = '''
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+heavy_modules = {heavy_modules!r}
+loaded_before = {{name for name in heavy_modules if name in sys.modules}}
+
+start = time.perf_counter()
+at = AppTest.from_file({app_path!r}, default_timeout=60).run()
+elapsed = time.perf_counter() - start
+
+print(json.dumps({{
+    'elapsed': elapsed,
+    'errors': [str(exc.value) for exc in at.exception],
+    'imported': [name for name in heavy_modules if name in sys.modules and name not in loaded_before],
+    'preloaded': sorted(loaded_before),
+}}))
+'''
+
+def measure_once(app_path):
+    """
+    Jalankan app.py sekali di proses baru, return dict hasil pengukuran
+    """
+    child_script = CHILD_SCRIPT.format(heavy_modules=HEAVY_MODULES, app_path=app_path)
+    result = subprocess.run(
+        [sys.executable, '-c', child_script],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Baris terakhir stdout berisi hasil JSON (baris lain adalah log streamlit)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Ukur waktu tampil halaman upload")
+    parser.add_argument('--runs', type=int, default=3, help="Jumlah percobaan")
+    parser.add_argument('--budget', type=float, default=0.5, help="Batas waktu (detik) untuk median")
+    parser.add_argument('--app', default=APP_PATH, help="Path app.py")
+    args = parser.parse_args()
+
+    results = [measure_once(args.app) for _ in range(args.runs)]
+    timings = sorted(result['elapsed'] for result in results)
+    median = timings[len(timings) // 2]
+    imported = sorted({name for result in results for name in result['imported']})
+    preloaded = sorted({name for result in results for name in result['preloaded']})
+    errors = [error for result in results for error in result['errors']]
+
+    print(f"Halaman upload: median {median * 1000:.0f} ms "
+          f"(min {timings[0] * 1000:.0f} ms, max {timings[-1] * 1000:.0f} ms, {args.runs} run)")
+    print(f"Library berat yang di-import: {', '.join(imported) if imported else '-'}")
+    if preloaded:
+        # Contoh: streamlit sendiri sudah meng-import plotly, jadi import plotly di app.py tidak terdeteksi
+        print(f"⚠️ Sudah di-import oleh streamlit sebelum app.py jalan (tidak bisa dicek): {', '.join(preloaded)}")
+
+    ok = True
+    if errors:
+        print(f"❌ Error saat menjalankan app: {errors[0]}")
+        ok = False
+    if imported:
+        print("❌ Library berat seharusnya baru di-import setelah file di-upload")
+        ok = False
+    if median > args.budget:
+        print(f"❌ Melebihi budget {args.budget * 1000:.0f} ms")
+        ok = False
+    if ok:
+        print("✅ OK")
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())